@@ -0,0 +1,83 @@
+# Copyright 2016 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+from scipy import stats
+import tensorflow as tf
+
+from tensorflow.contrib.distributions.python.ops import quantized_distribution_numba
+
+distributions = tf.contrib.distributions
+
+
+class LogProbNormalQuantizedTest(tf.test.TestCase):
+
+  def test_agrees_with_quantized_distribution(self):
+    y = np.arange(-50., 50.)
+    for lcut, ucut in [(None, None), (-3., None), (None, 4.), (-3., 4.)]:
+      with self.test_session():
+        qdist = distributions.QuantizedDistribution(
+            base_dist_cls=distributions.Normal,
+            lower_cutoff=lcut,
+            upper_cutoff=ucut,
+            mu=np.float64(0.3),
+            sigma=np.float64(1.7))
+        expected = qdist.log_prob(y).eval()
+      actual = quantized_distribution_numba.log_prob_normal_quantized(
+          y, loc=0.3, scale=1.7, lower_cutoff=lcut, upper_cutoff=ucut)
+      self.assertAllClose(expected, actual)
+
+  def test_agrees_with_scipy_near_the_median(self):
+    sp_normal = stats.norm(1., 2.)
+    y = np.array([[-2., -1., 0.], [1., 2., 3.]])
+    self.assertAllClose(
+        np.log(sp_normal.cdf(y) - sp_normal.cdf(y - 1)),
+        quantized_distribution_numba.log_prob_normal_quantized(
+            y, loc=1., scale=2.))
+
+  def test_kernel_agrees_with_vectorized_version(self):
+    # Whichever of the two is not used here, it should still give the same
+    # results, including far out in the tails.
+    if not quantized_distribution_numba.HAS_SCIPY:
+      return
+    y = np.concatenate([np.arange(-50., 50.), [-1e4, 1e4]])
+    for lcut, ucut in [(None, None), (-3., None), (None, 4.), (-3., 4.)]:
+      expected = quantized_distribution_numba._log_prob_vectorized(
+          y, 0.3, 1.7, lcut, ucut)
+      actual = np.empty_like(y)
+      quantized_distribution_numba._log_prob_kernel(
+          y, 0.3, 1.7,
+          np.nan if lcut is None else lcut,
+          np.nan if ucut is None else ucut,
+          lcut is not None, ucut is not None, actual)
+      self.assertAllClose(expected, actual)
+
+  def test_nan_gives_nan(self):
+    self.assertTrue(np.isnan(
+        quantized_distribution_numba.log_prob_normal_quantized(
+            [np.nan], loc=0., scale=1., lower_cutoff=-3., upper_cutoff=4.)[0]))
+
+  def test_cutoffs_must_be_ordered(self):
+    with self.assertRaisesRegexp(ValueError, "strictly less"):
+      quantized_distribution_numba.log_prob_normal_quantized(
+          [0.], loc=0., scale=1., lower_cutoff=1., upper_cutoff=1.)
+
+
+if __name__ == "__main__":
+  tf.test.main()
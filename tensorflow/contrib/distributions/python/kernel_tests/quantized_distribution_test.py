@@ -21,6 +21,8 @@ import numpy as np
 from scipy import stats
 import tensorflow as tf
 
+from tensorflow.contrib.distributions.python.ops import quantized_distribution
+
 distributions = tf.contrib.distributions
 
 
@@ -123,6 +125,21 @@ class QuantizedDistributionTest(tf.test.TestCase):
       # pmf(10) = P[Y <= 10] = P[Y <= 1] = pmf(1).
       self.assertAllClose(1., qdist.cdf(10.0).eval())
 
+  def test_log_prob_of_uniform_with_cutoffs_in_the_middle(self):
+    with self.test_session():
+      # Uniform does not implement log_survival_function, so log_prob is
+      # computed from log_cdf alone.  See the test above for the intervals.
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Uniform,
+          lower_cutoff=-1.0,
+          upper_cutoff=1.0,
+          a=-3.0,
+          b=3.0)
+
+      y = np.array([-2., -1., 0., 1., 2.], dtype=np.float32)
+      expected_pmf = [0., 1 / 3, 1 / 6, 1 / 2, 0.]
+      self.assertAllClose(np.log(expected_pmf), qdist.log_prob(y).eval())
+
   def test_quantization_of_batch_of_uniforms(self):
     batch_shape = (5, 5)
     with self.test_session():
@@ -185,6 +202,54 @@ class QuantizedDistributionTest(tf.test.TestCase):
       self.assertAllClose(
           [0.6827 / 2, 0.6827 / 2], (samps_v == 1).mean(axis=0), rtol=0.03)
 
+  def test_integer_sample_dtype(self):
+    with self.test_session():
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Normal,
+          lower_cutoff=-3.,
+          upper_cutoff=3.,
+          sample_dtype=tf.int32,
+          mu=0.,
+          sigma=2.)
+      self.assertEqual(tf.float32, qdist.dtype)
+
+      samps = qdist.sample_n(n=100, seed=42)
+      self.assertEqual(tf.int32, samps.dtype)
+      samps_v = samps.eval()
+      self.assertLessEqual(-3, samps_v.min())
+      self.assertGreaterEqual(3, samps_v.max())
+
+      # Integer samples may be passed back to the pmf and cdf.
+      self.assertAllClose(
+          qdist.prob(samps_v.astype(np.float32)).eval(),
+          qdist.prob(samps_v).eval())
+      self.assertAllClose(
+          qdist.cdf(samps_v.astype(np.float32)).eval(),
+          qdist.cdf(samps_v).eval())
+
+  def test_integer_sample_dtype_without_cutoffs_clamps_to_its_range(self):
+    with self.test_session():
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Normal,
+          sample_dtype=tf.int8,
+          mu=[0., np.inf, -np.inf],
+          sigma=1e3)
+
+      samps_v = qdist.sample_n(n=100, seed=42).eval()
+      self.assertEqual(np.int8, samps_v.dtype)
+      self.assertAllEqual([-128, 127], [samps_v[:, 0].min(),
+                                        samps_v[:, 0].max()])
+      self.assertAllEqual(np.full(100, 127), samps_v[:, 1])
+      self.assertAllEqual(np.full(100, -128), samps_v[:, 2])
+
+  def test_non_integer_sample_dtype_raises(self):
+    with self.assertRaisesRegexp(TypeError, "sample_dtype"):
+      distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Normal,
+          sample_dtype=tf.float64,
+          mu=0.,
+          sigma=1.)
+
   def test_samples_agree_with_cdf_for_samples_over_large_range(self):
     # Consider the cdf for distribution X, F(x).
     # If U ~ Uniform[0, 1], then Y := F^{-1}(U) is distributed like X since
@@ -281,6 +346,49 @@ class QuantizedDistributionTest(tf.test.TestCase):
           sp_normal.logsf(x),
           qdist.log_survival_function(x).eval())
 
+  def test_normal_cdf_and_log_cdf_with_cutoffs(self):
+    # With static cutoffs, the cdf is looked up in a precomputed table.
+    with self.test_session():
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Normal,
+          mu=0.,
+          sigma=1.,
+          lower_cutoff=-2.,
+          upper_cutoff=2.)
+      sm_normal = stats.norm(0., 1.)
+      y = np.array([-10., -3., -2., -0.5, 0., 1.5, 2., 10.], dtype=np.float32)
+      expected_cdf = np.where(
+          y < -2., 0., np.where(y >= 2., 1., sm_normal.cdf(np.floor(y))))
+      self.assertAllClose(expected_cdf, qdist.cdf(y).eval())
+      self.assertAllClose(np.log(expected_cdf), qdist.log_cdf(y).eval())
+
+  def test_normal_cdf_and_log_cdf_with_cutoffs_at_nan_and_inf(self):
+    with self.test_session():
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Normal,
+          mu=0.,
+          sigma=1.,
+          lower_cutoff=-2.,
+          upper_cutoff=2.)
+      sm_normal = stats.norm(0., 1.)
+      # Enough points that the cdf is tabulated.
+      y = np.array(
+          [np.nan, -np.inf, -3., -2., -1., 0., 1., np.inf], dtype=np.float32)
+      expected_cdf = np.concatenate(
+          [[0.], sm_normal.cdf([-2., -1., 0., 1.]), [1.]])
+
+      cdf_ = qdist.cdf(y).eval()
+      self.assertTrue(np.isnan(cdf_[0]))
+      self.assertAllClose([0.], cdf_[1:2])
+      self.assertAllClose(expected_cdf, cdf_[2:])
+      log_cdf_ = qdist.log_cdf(y).eval()
+      self.assertTrue(np.isnan(log_cdf_[0]))
+      self.assertAllClose([-np.inf], log_cdf_[1:2])
+      self.assertAllClose(np.log(expected_cdf), log_cdf_[2:])
+
+      # A scalar is evaluated without the table, and agrees with it.
+      self.assertAllClose(sm_normal.cdf(0.), qdist.cdf(0.5).eval())
+
   def test_normal_prob_with_cutoffs(self):
     # At integer values, the result should be the same as the standard normal.
     with self.test_session():
@@ -349,6 +457,95 @@ class QuantizedDistributionTest(tf.test.TestCase):
           qdist.log_prob(2.).eval(),
           atol=0)
 
+  def test_normal_prob_and_log_prob_beyond_cutoffs(self):
+    with self.test_session():
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Normal,
+          mu=0.,
+          sigma=1.,
+          lower_cutoff=-2.,
+          upper_cutoff=2.)
+      sm_normal = stats.norm(0., 1.)
+      y = np.array([-4., -3., -2., 0., 2., 3., 4.])
+      expected_pmf = [
+          0., 0., sm_normal.cdf(-2), sm_normal.cdf(0) - sm_normal.cdf(-1),
+          sm_normal.sf(1), 0., 0.
+      ]
+      self.assertAllClose(expected_pmf, qdist.prob(y).eval())
+      self.assertAllClose(np.log(expected_pmf), qdist.log_prob(y).eval())
+
+  def test_log_prob_range_agrees_with_log_prob(self):
+    batch_shape = (2,)
+    with self.test_session():
+      for lcut, ucut in [(None, None), (-2., 3.)]:
+        qdist = distributions.QuantizedDistribution(
+            base_dist_cls=distributions.Normal,
+            lower_cutoff=lcut,
+            upper_cutoff=ucut,
+            mu=[0., 1.],
+            sigma=[1., 2.])
+        y = np.arange(-5, 6).astype(np.float32)
+        expected = qdist.log_prob(
+            np.tile(y[:, np.newaxis], (1,) + batch_shape)).eval()
+
+        log_prob_range = qdist.log_prob_range(-5, 5).eval()
+        self.assertEqual((11,) + batch_shape, log_prob_range.shape)
+        self.assertAllClose(expected, log_prob_range)
+
+  def test_log_prob_range_of_uniform_with_cutoffs_in_the_middle(self):
+    with self.test_session():
+      # Uniform implements log_cdf, but not log_survival_function.
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Uniform,
+          lower_cutoff=-1.0,
+          upper_cutoff=1.0,
+          a=-3.0,
+          b=3.0)
+      expected_pmf = [0., 1 / 3, 1 / 6, 1 / 2, 0.]
+      self.assertAllClose(
+          np.log(expected_pmf), qdist.log_prob_range(-2, 2).eval())
+
+  def test_log_prob_range_with_upper_below_lower_raises(self):
+    with self.test_session():
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Normal,
+          mu=0.,
+          sigma=1.,
+          validate_args=True)
+      with self.assertRaisesOpError("lower must be at most upper"):
+        qdist.log_prob_range(3, 2).eval()
+
+  def test_log_prob_of_normal_with_large_sigma(self):
+    # Adjacent cdf values nearly coincide, so the log pmf is
+    # Log[exp{big} - exp{small}] with small - big of about -1e-3.
+    with self.test_session():
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Normal, mu=0., sigma=1e3)
+      sm_normal = stats.norm(0., 1e3)
+      y = np.arange(-5., 6., dtype=np.float32)
+      expected = np.log(sm_normal.cdf(y) - sm_normal.cdf(y - 1))
+      # The float32 log cdf values themselves differ from the exact ones by
+      # about 1e-5 relative to this difference, and this bounds rtol.
+      self.assertAllClose(expected, qdist.log_prob(y).eval(), rtol=5e-5)
+
+  def test_logsum_expbig_minus_expsmall_for_nearly_equal_arguments(self):
+    # Log cdf values at adjacent whole numbers, as above.  Computing
+    # Log[1 - exp{small - big}] directly loses about 5e-6 relative precision
+    # here, so the float32 result is compared to the float64 result from the
+    # same inputs with a tight rtol.
+    with self.test_session():
+      sm_normal = stats.norm(0., 1e3)
+      y = np.arange(-5., 6.)
+      big = sm_normal.logcdf(y).astype(np.float32)
+      small = sm_normal.logcdf(y - 1).astype(np.float32)
+      big_64 = big.astype(np.float64)
+      expected = np.log(-np.expm1(small.astype(np.float64) - big_64)) + big_64
+      self.assertAllClose(
+          expected,
+          quantized_distribution._logsum_expbig_minus_expsmall(
+              big, small).eval(),
+          rtol=1e-6, atol=0.)
+
   def test_log_prob_and_grad_gives_finite_results(self):
     with self.test_session():
       for dtype in [np.float32, np.float64]:
@@ -388,6 +585,47 @@ class QuantizedDistributionTest(tf.test.TestCase):
       self._assert_all_finite(grads[0].eval())
       self._assert_all_finite(grads[1].eval())
 
+  def test_prob_with_unknown_shapes(self):
+    with self.test_session() as sess:
+      mu = tf.placeholder(tf.float32)
+      y = tf.placeholder(tf.float32)
+      sm_normal = stats.norm(0., 1.)
+      for lcut, ucut in [(None, None), (-2., 2.)]:
+        qdist = distributions.QuantizedDistribution(
+            base_dist_cls=distributions.Normal,
+            lower_cutoff=lcut,
+            upper_cutoff=ucut,
+            mu=mu,
+            sigma=1.)
+        self.assertAllClose(
+            sm_normal.cdf(0) - sm_normal.cdf(-1),
+            sess.run(qdist.prob(0.), feed_dict={mu: 0.}))
+        self.assertAllClose(
+            [sm_normal.cdf(0) - sm_normal.cdf(-1)],
+            sess.run(qdist.prob(y), feed_dict={mu: 0., y: [0.]}))
+
+  def test_log_prob_with_unknown_shapes(self):
+    with self.test_session() as sess:
+      mu = tf.placeholder(tf.float32)
+      y = tf.placeholder(tf.float32)
+      sm_normal = stats.norm(0., 1.)
+      expected = np.log(sm_normal.cdf(0) - sm_normal.cdf(-1))
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Normal, mu=mu, sigma=1.)
+
+      self.assertAllClose(
+          expected, sess.run(qdist.log_prob(0.), feed_dict={mu: 0.}))
+      self.assertAllClose(
+          [expected, expected],
+          sess.run(qdist.log_prob(y), feed_dict={mu: 0., y: [0., 0.]}))
+
+      # Uniform has no log_survival_function, so this uses the log_cdf path.
+      qdist = distributions.QuantizedDistribution(
+          base_dist_cls=distributions.Uniform, a=mu, b=4.)
+      self.assertAllClose(
+          [np.log(0.25)],
+          sess.run(qdist.log_prob(y), feed_dict={mu: 0., y: [1.]}))
+
   def test_lower_cutoff_must_be_below_upper_cutoff_or_we_raise(self):
     with self.test_session():
       qdist = distributions.QuantizedDistribution(
@@ -23,7 +23,10 @@ import numpy as np
 from tensorflow.contrib.distributions.python.ops import distribution
 from tensorflow.contrib.distributions.python.ops import distribution_util
 from tensorflow.contrib.framework.python.framework import tensor_util as contrib_tensor_util
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_util
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import check_ops
 from tensorflow.python.ops import control_flow_ops
@@ -31,6 +34,9 @@ from tensorflow.python.ops import math_ops
 
 __all__ = ["QuantizedDistribution"]
 
+# Largest cdf table, in entries, that QuantizedDistribution will tabulate.
+_MAX_CDF_TABLE_SIZE = 512
+
 
 def _logsum_expbig_minus_expsmall(big, small):
   """Stable evaluation of `Log[exp{big} - exp{small}]`.
@@ -45,7 +51,124 @@ def _logsum_expbig_minus_expsmall(big, small):
     `Tensor` of same `dtype` of `big` and broadcast shape.
   """
   with ops.name_scope("logsum_expbig_minus_expsmall", values=[small, big]):
-    return math_ops.log(1. - math_ops.exp(small - big)) + big
+    # Log[exp{big} - exp{small}] = big + Log[1 - exp{d}], with d = small - big.
+    d = small - big
+    log_2 = np.log(2.)
+
+    # For d close to zero, 1 - exp{d} suffers from catastrophic cancellation.
+    # There we use the identity
+    #   1 - exp{d} = -expm1(d) = -2 tanh(d / 2) / (1 - tanh(d / 2)),
+    # which is accurate since tanh is accurate near zero.  For d <= -Log[2],
+    # 1 - exp{d} is in [1/2, 1) and may be computed directly.
+    # Each branch only sees values of d in its own region, so the branch not
+    # selected is always in [1/2, 1) and never turns the gradient into NaN.
+    # Selecting before the Log means a single Log evaluates both branches.
+    tanh_half_d = math_ops.tanh(0.5 * math_ops.maximum(d, -log_2))
+    near_zero = -2. * tanh_half_d / (1. - tanh_half_d)
+    far_from_zero = 1. - math_ops.exp(math_ops.minimum(d, -log_2))
+
+    return math_ops.log(
+        math_ops.select(d > -log_2, near_zero, far_from_zero)) + big
+
+
+def _broadcast_like(x, like):
+  """Broadcast `x` against `like`, only adding zeros if shapes may differ.
+
+  Args:
+    x: Numeric `Tensor`.
+    like: Numeric `Tensor` with same `dtype` as `x` and broadcastable shape.
+
+  Returns:
+    `Tensor` with same values as `x` and the broadcast shape of `x`, `like`.
+  """
+  x_shape = x.get_shape()
+  if x_shape.is_fully_defined() and x_shape == like.get_shape():
+    return x
+  return x + array_ops.zeros_like(like)
+
+
+def _select_scalar(condition, scalar, tensor):
+  """Returns `scalar` where `condition` is `True`, and `tensor` elsewhere.
+
+  `select` requires its branches to have the same shape, so `scalar` is filled
+  into the shape of `tensor` directly, rather than materializing `ones_like` or
+  `zeros_like` and scaling.
+
+  Args:
+    condition: Boolean `Tensor` with the same shape as `tensor`.
+    scalar: Scalar `Tensor` with same `dtype` as `tensor`.
+    tensor: Numeric `Tensor`.
+
+  Returns:
+    `Tensor` with same shape and `dtype` as `tensor`.
+  """
+  return math_ops.select(
+      condition, array_ops.fill(array_ops.shape(tensor), scalar), tensor)
+
+
+def _unpack_pair(x):
+  """Splits `x`, evaluated at `[j, j - 1]` packed, into `x(j)`, `x(j - 1)`.
+
+  `num` is given explicitly, since `x` may have unknown rank, e.g. if the
+  base distribution's parameters do.
+
+  Args:
+    x: `Tensor` with leading dimension `2`.
+
+  Returns:
+    Pair of `Tensor`s, `x` at `j` and at `j - 1`.
+  """
+  return array_ops.unpack(x, num=2)
+
+
+def _split_consecutive(x):
+  """Splits `x`, evaluated at `[j_0 - 1, ..., j_n]`, into `x(j)`, `x(j - 1)`.
+
+  Args:
+    x: `Tensor` with leading dimension indexing consecutive whole numbers.
+
+  Returns:
+    Pair of `Tensor`s, `x` at `j = j_0, ..., j_n` and at `j - 1`.
+  """
+  return x[1:], x[:-1]
+
+
+def _representable_range(int_dtype, float_dtype):
+  """Whole numbers in `float_dtype` that cast to `int_dtype` without overflow.
+
+  Args:
+    int_dtype: Integer `DType`.
+    float_dtype: Floating point `DType`.
+
+  Returns:
+    Pair `(low, high)` of `float_dtype` NumPy scalars, such that every whole
+    number in `[low, high]` casts from `float_dtype` to `int_dtype` without
+    overflow.
+  """
+  np_dtype = float_dtype.as_numpy_dtype
+  # The min of a signed integer dtype is a power of two, so is exact.
+  low = np_dtype(int_dtype.min)
+  # The max may round up to a value just beyond the integer range.
+  high = np_dtype(int_dtype.max)
+  if int(high) > int_dtype.max:
+    high = np.nextafter(high, np_dtype(0))
+  return low, high
+
+
+def _split_masks(masks, split):
+  """Splits cutoff masks into masks at `j` and at `j - 1`.
+
+  Args:
+    masks: Pair `(below, above)` of boolean `Tensor`s, or `None`.
+    split: Function that splits a `Tensor` evaluated at the packed points into
+      the pair of `Tensor`s at `j` and at `j - 1`.
+
+  Returns:
+    Pair `(masks_at_j, masks_at_j_minus_1)`, each a pair `(below, above)`.
+  """
+  below, above = [
+      (None, None) if mask is None else split(mask) for mask in masks]
+  return (below[0], above[0]), (below[1], above[1])
 
 
 class QuantizedDistribution(distribution.Distribution):
@@ -106,6 +229,7 @@ class QuantizedDistribution(distribution.Distribution):
                lower_cutoff=None,
                upper_cutoff=None,
                name="QuantizedDistribution",
+               sample_dtype=None,
                **base_dist_args):
     """Construct a Quantized Distribution.
 
@@ -127,12 +251,18 @@ class QuantizedDistribution(distribution.Distribution):
         `upper_cutoff - 1`.
         `upper_cutoff` must be strictly greater than `lower_cutoff`.
       name: The name for the distribution.
+      sample_dtype:  `dtype` of samples.  Either `None`, meaning the `dtype` of
+        this distribution, or an integer `dtype` such as `int32`, which avoids
+        storing whole numbers as floats.  Integer values passed to the (log)
+        prob, cdf and survival function are cast to this distribution's
+        `dtype`.
       **base_dist_args: kwargs to pass on to dist_cls on construction.
         These determine the shape and dtype of this distribution.
 
     Raises:
       TypeError: If `base_dist_cls` is not a subclass of
-          `Distribution` or continuous.
+          `Distribution` or continuous, or `sample_dtype` is neither `None` nor
+          an integer `dtype`.
       AttributeError:  If the base distribution does not implement `cdf`.
     """
     if not issubclass(base_dist_cls, distribution.Distribution):
@@ -145,6 +275,7 @@ class QuantizedDistribution(distribution.Distribution):
               "base_dist_cls": base_dist_cls,
               "lower_cutoff": lower_cutoff,
               "upper_cutoff": upper_cutoff,
+              "sample_dtype": sample_dtype,
               "base_dist_args": base_dist_args,
           },
           is_continuous=False,
@@ -153,6 +284,15 @@ class QuantizedDistribution(distribution.Distribution):
           allow_nan_stats=self._base_dist.allow_nan_stats,
           name=name)
 
+      if sample_dtype is None:
+        sample_dtype = self.dtype
+      sample_dtype = dtypes.as_dtype(sample_dtype)
+      if sample_dtype != self.dtype and not sample_dtype.is_integer:
+        raise TypeError(
+            "sample_dtype must be None or an integer dtype, got %s" %
+            sample_dtype)
+      self._sample_dtype = sample_dtype
+
       if lower_cutoff is not None:
         lower_cutoff = ops.convert_to_tensor(lower_cutoff, name="lower_cutoff")
       if upper_cutoff is not None:
@@ -160,22 +300,45 @@ class QuantizedDistribution(distribution.Distribution):
       contrib_tensor_util.assert_same_float_dtype(
           tensors=[self.base_distribution, lower_cutoff, upper_cutoff])
 
+      # Cutoffs are typically Python constants.  Checks that hold for their
+      # static values are done here, and left out of the graph.
+      lower_cutoff_value = None
+      upper_cutoff_value = None
+      if lower_cutoff is not None:
+        lower_cutoff_value = tensor_util.constant_value(lower_cutoff)
+      if upper_cutoff is not None:
+        upper_cutoff_value = tensor_util.constant_value(upper_cutoff)
+
       checks = []
       if lower_cutoff is not None and upper_cutoff is not None:
-        message = "lower_cutoff must be strictly less than upper_cutoff."
-        checks.append(
-            check_ops.assert_less(
-                lower_cutoff, upper_cutoff, message=message))
-
-      with ops.control_dependencies(checks if self.validate_args else []):
-        if lower_cutoff is not None:
-          self._lower_cutoff = self._check_integer(lower_cutoff)
-        else:
-          self._lower_cutoff = None
-        if upper_cutoff is not None:
-          self._upper_cutoff = self._check_integer(upper_cutoff)
-        else:
-          self._upper_cutoff = None
+        if (lower_cutoff_value is None or upper_cutoff_value is None or
+            not np.all(lower_cutoff_value < upper_cutoff_value)):
+          message = "lower_cutoff must be strictly less than upper_cutoff."
+          checks.append(
+              check_ops.assert_less(
+                  lower_cutoff, upper_cutoff, message=message))
+
+      if lower_cutoff is not None:
+        lower_cutoff = self._check_integer(lower_cutoff)
+      if upper_cutoff is not None:
+        upper_cutoff = self._check_integer(upper_cutoff)
+      if checks and self.validate_args:
+        lower_cutoff = control_flow_ops.with_dependencies(checks, lower_cutoff)
+        upper_cutoff = control_flow_ops.with_dependencies(checks, upper_cutoff)
+      self._lower_cutoff = lower_cutoff
+      self._upper_cutoff = upper_cutoff
+
+      # Values taken at and beyond the cutoffs.  These are created once here,
+      # rather than as new constants in every cdf, survival function and pmf.
+      self._zero = constant_op.constant(0., dtype=self.dtype, name="zero")
+      self._one = constant_op.constant(1., dtype=self.dtype, name="one")
+      self._neg_inf = constant_op.constant(
+          -np.inf, dtype=self.dtype, name="neg_inf")
+
+      # Static cutoffs between which the cdf may be tabulated, or None.
+      self._cdf_table_cutoffs = None
+      if self._can_tabulate_cdf(lower_cutoff_value, upper_cutoff_value):
+        self._cdf_table_cutoffs = (lower_cutoff_value, upper_cutoff_value)
 
   def _batch_shape(self):
     return self.base_distribution.batch_shape()
@@ -190,50 +353,152 @@ class QuantizedDistribution(distribution.Distribution):
     return self.base_distribution.get_event_shape()
 
   def _sample_n(self, n, seed=None):
+    # Distribution.sample_n has already converted n to a Tensor, and opened a
+    # name scope for these ops.
     lower_cutoff = self._lower_cutoff
     upper_cutoff = self._upper_cutoff
-    with ops.name_scope("transform"):
-      n = ops.convert_to_tensor(n, name="n")
-      x_samps = self.base_distribution.sample_n(n=n, seed=seed)
-      ones = array_ops.ones_like(x_samps)
+    x_samps = self.base_distribution.sample_n(n=n, seed=seed)
 
-      # Snap values to the intervals (j - 1, j].
-      result_so_far = math_ops.ceil(x_samps)
+    # Snap values to the intervals (j - 1, j].
+    result_so_far = math_ops.ceil(x_samps)
 
-      if lower_cutoff is not None:
-        result_so_far = math_ops.select(result_so_far < lower_cutoff,
-                                        lower_cutoff * ones, result_so_far)
+    # Clamp to [lower_cutoff, upper_cutoff].  maximum/minimum broadcast the
+    # cutoffs, so no sample-sized tensor of cutoff values is needed.
+    if lower_cutoff is not None:
+      result_so_far = math_ops.maximum(result_so_far, lower_cutoff)
 
-      if upper_cutoff is not None:
-        result_so_far = math_ops.select(result_so_far > upper_cutoff,
-                                        upper_cutoff * ones, result_so_far)
+    if upper_cutoff is not None:
+      result_so_far = math_ops.minimum(result_so_far, upper_cutoff)
 
-      return result_so_far
+    if self._sample_dtype != self.dtype:
+      # Casting values beyond the range of sample_dtype, such as +-inf from a
+      # heavy tailed base distribution without cutoffs, is undefined.
+      low, high = _representable_range(self._sample_dtype, self.dtype)
+      result_so_far = math_ops.minimum(
+          math_ops.maximum(result_so_far, low), high)
+      result_so_far = math_ops.cast(result_so_far, self._sample_dtype)
+
+    return result_so_far
 
   def _log_prob(self, y):
     if not hasattr(self.base_distribution, "_log_cdf"):
       raise AttributeError(
           "'log_prob' not implemented unless the base distribution implements "
           "'log_cdf'")
-    y = self._check_integer(y)
+    # Evaluate the base distribution at j and j - 1 in a single call.
+    js = self._stack_with_predecessor(self._floor_checked_integer(y))
     if hasattr(self.base_distribution, "_log_survival_function"):
-      return self._log_prob_with_logsf_and_logcdf(y)
+      return self._log_prob_with_logsf_and_logcdf(js, _unpack_pair)
     else:
-      return self._log_prob_with_logcdf(y)
+      return self._log_prob_with_logcdf(js, _unpack_pair)
+
+  def log_prob_range(self, lower, upper, name="log_prob_range"):
+    """Log probability mass at each whole number in `[lower, upper]`.
+
+    Equal to `log_prob` evaluated at `lower, lower + 1, ..., upper`, but the
+    base distribution is evaluated at each of `lower - 1, ..., upper` only
+    once, in a single call, rather than twice per whole number.
+
+    Args:
+      lower:  Python integer or scalar `int32` `Tensor`.  Floats, even whole
+        numbers such as this distribution's own cutoffs, are rejected by
+        the conversion to `int32`.
+      upper:  Python integer or scalar `int32` `Tensor`, `upper >= lower`.
+        If `validate_args`, this is asserted.
+      name:  The name to give this op.
+
+    Returns:
+      log_prob:  `Tensor` of shape `[upper - lower + 1] + batch_shape`, and
+        same `dtype` as this distribution.
+
+    Raises:
+      AttributeError:  If the base distribution does not implement `log_cdf`.
+      TypeError:  If `lower` or `upper` is a float.
+    """
+    with self._name_scope(name, values=[lower, upper]):
+      if not hasattr(self.base_distribution, "_log_cdf"):
+        raise AttributeError(
+            "'log_prob_range' not implemented unless the base distribution "
+            "implements 'log_cdf'")
+      lower = ops.convert_to_tensor(lower, dtype=dtypes.int32, name="lower")
+      upper = ops.convert_to_tensor(upper, dtype=dtypes.int32, name="upper")
+      if self.validate_args:
+        lower_value = tensor_util.constant_value(lower)
+        upper_value = tensor_util.constant_value(upper)
+        if (lower_value is None or upper_value is None or
+            not lower_value <= upper_value):
+          upper = control_flow_ops.with_dependencies([
+              check_ops.assert_less_equal(
+                  lower, upper, message="lower must be at most upper.")
+          ], upper)
+      js = math_ops.cast(math_ops.range(lower - 1, upper + 1), self.dtype)
+
+      # Add trailing singleton dimensions, so that the points broadcast
+      # against the batch shape.
+      js = array_ops.reshape(js, array_ops.concat(
+          0, [[-1], array_ops.ones_like(self.batch_shape())]))
+
+      if hasattr(self.base_distribution, "_log_survival_function"):
+        return self._log_prob_with_logsf_and_logcdf(js, _split_consecutive)
+      else:
+        return self._log_prob_with_logcdf(js, _split_consecutive)
+
+  def _log_prob_with_logcdf(self, js, split):
+    """Log pmf at `j`, from the base log cdf at points `js`.
+
+    Args:
+      js:  `Tensor` of whole numbers, containing each `j` and `j - 1`.
+      split:  Function splitting a `Tensor` evaluated at `js` into the pair of
+        `Tensor`s at `j` and at `j - 1`.
+
+    Returns:
+      `Tensor`, the log pmf at each `j`.
+    """
+    logcdfs, masks = self._raw_log_cdf(js)
+    logcdf_y, logcdf_y_minus_1 = split(logcdfs)
+    masks_y, masks_y_minus_1 = _split_masks(masks, split)
+
+    # At j == upper_cutoff, P[Y = j] = P[X > j - 1] = 1 - cdf(j - 1), i.e. the
+    # difference below with Log[cdf(j)] replaced by Log[1] = 0.
+    _, above_y = masks_y
+    if above_y is not None:
+      logcdf_y = _select_scalar(above_y, self._zero, logcdf_y)
 
-  def _log_prob_with_logcdf(self, y):
-    return _logsum_expbig_minus_expsmall(self.log_cdf(y), self.log_cdf(y - 1))
+    result_so_far = _logsum_expbig_minus_expsmall(logcdf_y, logcdf_y_minus_1)
+
+    return self._apply_prob_cutoffs(
+        result_so_far,
+        mass_at_lower=logcdf_y,
+        mass_at_upper=None,
+        no_mass=self._neg_inf,
+        masks_y=masks_y,
+        masks_y_minus_1=masks_y_minus_1)
+
+  def _log_prob_with_logsf_and_logcdf(self, js, split):
+    """Log pmf at `j`, from the base log cdf and log sf at points `js`.
+
+    Args:
+      js:  `Tensor` of whole numbers, containing each `j` and `j - 1`.
+      split:  Function splitting a `Tensor` evaluated at `js` into the pair of
+        `Tensor`s at `j` and at `j - 1`.
+
+    Returns:
+      `Tensor`, the log pmf at each `j`.
+    """
+    # The base distribution is called once for each of the cdf and survival
+    # function.  Cutoffs are applied a single time, below, rather than once per
+    # call, and the cutoff masks are shared by the cdf and survival function.
+    logcdfs, masks = self._raw_log_cdf(js)
+    logsfs, _ = self._raw_log_survival_function(js, masks)
+    logcdf_y, logcdf_y_minus_1 = split(logcdfs)
+    logsf_y, logsf_y_minus_1 = split(logsfs)
+    masks_y, masks_y_minus_1 = _split_masks(masks, split)
 
-  def _log_prob_with_logsf_and_logcdf(self, y):
     # There are two options that would be equal if we had infinite precision:
     # Log[ sf(y - 1) - sf(y) ]
     #   = Log[ exp{logsf(y - 1)} - exp{logsf(y)} ]
     # Log[ cdf(y) - cdf(y - 1) ]
     #   = Log[ exp{logcdf(y)} - exp{logcdf(y - 1)} ]
-    logsf_y = self.log_survival_function(y)
-    logsf_y_minus_1 = self.log_survival_function(y - 1)
-    logcdf_y = self.log_cdf(y)
-    logcdf_y_minus_1 = self.log_cdf(y - 1)
 
     # Important:  Here we use select in a way such that no input is inf, this
     # prevents the troublesome case where the output of select can be finite,
@@ -241,44 +506,182 @@ class QuantizedDistribution(distribution.Distribution):
 
     # In either case, we are doing Log[ exp{big} - exp{small} ]
     # We want to use the sf items precisely when we are on the right side of the
-    # median, which occurs when logsf_y < logcdf_y.
-    big = math_ops.select(logsf_y < logcdf_y, logsf_y_minus_1, logcdf_y)
-    small = math_ops.select(logsf_y < logcdf_y, logsf_y, logcdf_y_minus_1)
-
-    return _logsum_expbig_minus_expsmall(big, small)
+    # median, which occurs when logsf_y < logcdf_y.  Both selects share the
+    # one comparison.
+    use_sf = logsf_y < logcdf_y
+    big = math_ops.select(use_sf, logsf_y_minus_1, logcdf_y)
+    small = math_ops.select(use_sf, logsf_y, logcdf_y_minus_1)
+
+    result_so_far = _logsum_expbig_minus_expsmall(big, small)
+
+    return self._apply_prob_cutoffs(
+        result_so_far,
+        mass_at_lower=logcdf_y,
+        mass_at_upper=logsf_y_minus_1,
+        no_mass=self._neg_inf,
+        masks_y=masks_y,
+        masks_y_minus_1=masks_y_minus_1)
 
   def _prob(self, y):
     if not hasattr(self.base_distribution, "_cdf"):
       raise AttributeError(
           "'prob' not implemented unless the base distribution implements "
           "'cdf'")
-    y = self._check_integer(y)
+    j = self._floor_checked_integer(y)
     if hasattr(self.base_distribution, "_survival_function"):
-      return self._prob_with_sf_and_cdf(y)
+      return self._prob_with_sf_and_cdf(j)
     else:
-      return self._prob_with_cdf(y)
+      return self._prob_with_cdf(j)
+
+  def _prob_with_cdf(self, j):
+    # Evaluate the base distribution at j and j - 1 in a single call.
+    js = self._stack_with_predecessor(j)
+    cdfs, masks = self._raw_cdf(js)
+    cdf_y, cdf_y_minus_1 = _unpack_pair(cdfs)
+    masks_y, masks_y_minus_1 = _split_masks(masks, _unpack_pair)
+
+    # At j == upper_cutoff, P[Y = j] = P[X > j - 1] = 1 - cdf(j - 1), i.e. the
+    # difference below with cdf(j) replaced by 1.
+    _, above_y = masks_y
+    if above_y is not None:
+      cdf_y = _select_scalar(above_y, self._one, cdf_y)
+
+    return self._apply_prob_cutoffs(
+        cdf_y - cdf_y_minus_1,
+        mass_at_lower=cdf_y,
+        mass_at_upper=None,
+        no_mass=self._zero,
+        masks_y=masks_y,
+        masks_y_minus_1=masks_y_minus_1)
+
+  def _prob_with_sf_and_cdf(self, j):
+    js = self._stack_with_predecessor(j)
+    cdfs, masks = self._raw_cdf(js)
+    sfs, _ = self._raw_survival_function(js, masks)
+    cdf_y, cdf_y_minus_1 = _unpack_pair(cdfs)
+    sf_y, sf_y_minus_1 = _unpack_pair(sfs)
+    masks_y, masks_y_minus_1 = _split_masks(masks, _unpack_pair)
 
-  def _prob_with_cdf(self, y):
-    return self.cdf(y) - self.cdf(y - 1)
-
-  def _prob_with_sf_and_cdf(self, y):
     # There are two options that would be equal if we had infinite precision:
     # sf(y - 1) - sf(y)
     # cdf(y) - cdf(y - 1)
-    sf_y = self.survival_function(y)
-    sf_y_minus_1 = self.survival_function(y - 1)
-    cdf_y = self.cdf(y)
-    cdf_y_minus_1 = self.cdf(y - 1)
-
     # sf_prob has greater precision iff we're on the right side of the median.
-    return math_ops.select(
+    result_so_far = math_ops.select(
         sf_y < cdf_y,  # True iff we're on the right side of the median.
         sf_y_minus_1 - sf_y,
         cdf_y - cdf_y_minus_1)
 
-  def _log_cdf(self, y):
+    return self._apply_prob_cutoffs(
+        result_so_far,
+        mass_at_lower=cdf_y,
+        mass_at_upper=sf_y_minus_1,
+        no_mass=self._zero,
+        masks_y=masks_y,
+        masks_y_minus_1=masks_y_minus_1)
+
+  def _apply_prob_cutoffs(self, result_so_far, mass_at_lower, mass_at_upper,
+                          no_mass, masks_y, masks_y_minus_1):
+    """Re-define a (log) pmf computed without cutoffs at and beyond them.
+
+    Args:
+      result_so_far:  `Tensor`, (log) `P[j - 1 < X <= j]` for `j = floor(y)`.
+      mass_at_lower:  `Tensor`, (log) `P[X <= j]`, the mass at `lower_cutoff`.
+      mass_at_upper:  `Tensor`, (log) `P[X > j - 1]`, the mass at
+        `upper_cutoff`, or `None` if `result_so_far` is already correct there.
+      no_mass:  Scalar `Tensor`, the (log) mass outside the cutoffs.
+      masks_y:  Pair `(j < lower_cutoff, j >= upper_cutoff)`, as returned by
+        the `_raw_*` methods.
+      masks_y_minus_1:  Same pair, evaluated at `j - 1`.
+
+    Returns:
+      `Tensor` with same shape and `dtype` as `result_so_far`.
+    """
+    below_y, above_y = masks_y
+    below_y_minus_1, above_y_minus_1 = masks_y_minus_1
+
+    # P[Y = j] = P[X <= j] if j == lower_cutoff.
+    if below_y is not None:
+      result_so_far = math_ops.select(
+          below_y_minus_1, mass_at_lower, result_so_far)
+
+    # P[Y = j] = P[X > j - 1] if j == upper_cutoff.
+    if above_y is not None and mass_at_upper is not None:
+      result_so_far = math_ops.select(above_y, mass_at_upper, result_so_far)
+
+    # P[Y = j] = 0 if j < lower_cutoff or j > upper_cutoff.  Both cases are
+    # handled by one select, so no_mass is only filled in once.
+    outside = below_y
+    if above_y_minus_1 is not None:
+      if outside is None:
+        outside = above_y_minus_1
+      else:
+        outside = math_ops.logical_or(outside, above_y_minus_1)
+    if outside is not None:
+      result_so_far = _select_scalar(outside, no_mass, result_so_far)
+
+    return result_so_far
+
+  def _cutoff_masks(self, j):
+    """Returns the pair `(j < lower_cutoff, j >= upper_cutoff)`.
+
+    Either element is `None` if the corresponding cutoff is `None`.
+    """
     lower_cutoff = self._lower_cutoff
     upper_cutoff = self._upper_cutoff
+    below = None if lower_cutoff is None else j < lower_cutoff
+    above = None if upper_cutoff is None else j >= upper_cutoff
+    return below, above
+
+  def _stack_with_predecessor(self, j):
+    """Returns `[j, j - 1]`, packed along a new leading dimension.
+
+    This allows the base distribution to be evaluated at both points with a
+    single call.  `j` is first broadcast against the batch shape if needed, so
+    that the packed points still broadcast against the base distribution's
+    parameters.
+
+    Args:
+      j:  `Tensor` of whole numbers.
+
+    Returns:
+      `Tensor` with same `dtype` as `j`, and shape `[2] + S`, where `S` is the
+      broadcast of the shape of `j` and the batch shape.
+    """
+    batch_ndims = self.get_batch_shape().ndims
+    j_ndims = j.get_shape().ndims
+    if batch_ndims is None or j_ndims is None or j_ndims < batch_ndims:
+      j += array_ops.zeros(self.batch_shape(), dtype=j.dtype)
+    return array_ops.pack([j, j - 1])
+
+  def _with_cutoff_masks(self, result, j, masks):
+    """Returns `(result, masks)`, computing the masks at `j` if not given."""
+    if masks is None:
+      # Broadcast, because it's possible that this is a single distribution
+      # being evaluated on a number of samples, or something like that.
+      masks = self._cutoff_masks(_broadcast_like(j, result))
+    return result, masks
+
+  def _raw_log_cdf(self, j, masks=None):
+    """Returns `log P[X <= j]`, before cutoffs, and the cutoff masks at `j`."""
+    return self._with_cutoff_masks(
+        self.base_distribution.log_cdf(j), j, masks)
+
+  def _raw_cdf(self, j, masks=None):
+    """Returns `P[X <= j]`, before cutoffs, and the cutoff masks at `j`."""
+    return self._with_cutoff_masks(self.base_distribution.cdf(j), j, masks)
+
+  def _raw_log_survival_function(self, j, masks=None):
+    """Returns `log P[X > j]`, before cutoffs, and the cutoff masks at `j`."""
+    return self._with_cutoff_masks(
+        self.base_distribution.log_survival_function(j), j, masks)
+
+  def _raw_survival_function(self, j, masks=None):
+    """Returns `P[X > j]`, before cutoffs, and the cutoff masks at `j`."""
+    return self._with_cutoff_masks(
+        self.base_distribution.survival_function(j), j, masks)
+
+  def _log_cdf(self, y):
+    y = self._cast_if_integer(y)
 
     # Recall the promise:
     # cdf(y) := P[Y <= y]
@@ -286,30 +689,28 @@ class QuantizedDistribution(distribution.Distribution):
     #         = 0, if y < lower_cutoff,
     #         = P[X <= y], otherwise.
 
+    if self._use_cdf_table(y):
+      table = self._make_cdf_table(
+          self.base_distribution.log_cdf, self._neg_inf, self._zero,
+          name="log_cdf_table")
+      return self._cdf_table_lookup(table, y)
+
     # P[Y <= j] = P[floor(Y) <= j] since mass is only at integers, not in
     # between.
     j = math_ops.floor(y)
 
-    result_so_far = self.base_distribution.log_cdf(j)
-
-    # Broadcast, because it's possible that this is a single distribution being
-    # evaluated on a number of samples, or something like that.
-    j += array_ops.zeros_like(result_so_far)
+    result_so_far, (below, above) = self._raw_log_cdf(j)
 
     # Re-define values at the cutoffs.
-    if lower_cutoff is not None:
-      neg_inf = -np.inf * array_ops.ones_like(result_so_far)
-      result_so_far = math_ops.select(j < lower_cutoff, neg_inf, result_so_far)
-    if upper_cutoff is not None:
-      result_so_far = math_ops.select(j >= upper_cutoff,
-                                      array_ops.zeros_like(result_so_far),
-                                      result_so_far)
+    if below is not None:
+      result_so_far = _select_scalar(below, self._neg_inf, result_so_far)
+    if above is not None:
+      result_so_far = _select_scalar(above, self._zero, result_so_far)
 
     return result_so_far
 
   def _cdf(self, y):
-    lower_cutoff = self._lower_cutoff
-    upper_cutoff = self._upper_cutoff
+    y = self._cast_if_integer(y)
 
     # Recall the promise:
     # cdf(y) := P[Y <= y]
@@ -317,32 +718,121 @@ class QuantizedDistribution(distribution.Distribution):
     #         = 0, if y < lower_cutoff,
     #         = P[X <= y], otherwise.
 
+    if self._use_cdf_table(y):
+      table = self._make_cdf_table(
+          self.base_distribution.cdf, self._zero, self._one, name="cdf_table")
+      return self._cdf_table_lookup(table, y)
+
     # P[Y <= j] = P[floor(Y) <= j] since mass is only at integers, not in
     # between.
     j = math_ops.floor(y)
 
     # P[X <= j], used when lower_cutoff < X < upper_cutoff.
-    result_so_far = self.base_distribution.cdf(j)
-
-    # Broadcast, because it's possible that this is a single distribution being
-    # evaluated on a number of samples, or something like that.
-    j += array_ops.zeros_like(result_so_far)
+    result_so_far, (below, above) = self._raw_cdf(j)
 
     # Re-define values at the cutoffs.
-    if lower_cutoff is not None:
-      result_so_far = math_ops.select(j < lower_cutoff,
-                                      array_ops.zeros_like(result_so_far),
-                                      result_so_far)
-    if upper_cutoff is not None:
-      result_so_far = math_ops.select(j >= upper_cutoff,
-                                      array_ops.ones_like(result_so_far),
-                                      result_so_far)
+    if below is not None:
+      result_so_far = _select_scalar(below, self._zero, result_so_far)
+    if above is not None:
+      result_so_far = _select_scalar(above, self._one, result_so_far)
 
     return result_so_far
 
+  def _can_tabulate_cdf(self, lower_cutoff_value, upper_cutoff_value):
+    """Whether the cdf and log cdf can be tabulated between the cutoffs.
+
+    If this is a scalar distribution and the cutoffs are static, scalar whole
+    numbers, then `cdf(y)` takes only the `upper_cutoff - lower_cutoff + 2`
+    values
+
+    ```
+    0, P[X <= lower_cutoff], ..., P[X <= upper_cutoff - 1], 1.
+    ```
+
+    Tabulating these turns `cdf` and `log_cdf` into a `gather`, rather than
+    a base distribution cdf evaluation at every point.  The table is evaluated
+    along with the graph, on every run, so it is only used for at most
+    `_MAX_CDF_TABLE_SIZE` entries, and only for `y` with at least as many
+    points as the table (see `_use_cdf_table`).
+
+    Args:
+      lower_cutoff_value:  Static value of `lower_cutoff`, or `None`.
+      upper_cutoff_value:  Static value of `upper_cutoff`, or `None`.
+
+    Returns:
+      Python `bool`.
+    """
+    if lower_cutoff_value is None or upper_cutoff_value is None:
+      return False
+    if (np.ndim(lower_cutoff_value) != 0 or np.ndim(upper_cutoff_value) != 0 or
+        self.get_batch_shape().ndims != 0 or
+        self.get_event_shape().ndims != 0):
+      return False
+    if (lower_cutoff_value != np.floor(lower_cutoff_value) or
+        upper_cutoff_value != np.floor(upper_cutoff_value) or
+        not lower_cutoff_value < upper_cutoff_value):
+      return False
+    return upper_cutoff_value - lower_cutoff_value + 2 <= _MAX_CDF_TABLE_SIZE
+
+  def _use_cdf_table(self, y):
+    """Whether to look up the (log) cdf at `y` in a table.
+
+    The table costs one base cdf evaluation per entry, so it only pays off if
+    `y` statically has at least as many points as the table has entries.
+
+    Args:
+      y:  `Tensor` at which the (log) cdf is evaluated.
+
+    Returns:
+      Python `bool`.
+    """
+    if self._cdf_table_cutoffs is None:
+      return False
+    lower_cutoff_value, upper_cutoff_value = self._cdf_table_cutoffs
+    num_points = y.get_shape().num_elements()
+    return (num_points is not None and
+            num_points >= upper_cutoff_value - lower_cutoff_value + 2)
+
+  def _make_cdf_table(self, base_cdf_fn, below_value, above_value, name):
+    """Tabulates `base_cdf_fn` at `lower_cutoff - 1, ..., upper_cutoff`.
+
+    Args:
+      base_cdf_fn:  The base distribution `cdf` or `log_cdf`.
+      below_value:  Scalar `Tensor`, value of the table below `lower_cutoff`.
+      above_value:  Scalar `Tensor`, value of the table at `upper_cutoff`.
+      name:  Name of the table.
+
+    Returns:
+      Rank 1 `Tensor` with `upper_cutoff - lower_cutoff + 2` entries.
+    """
+    lower_cutoff_value, upper_cutoff_value = self._cdf_table_cutoffs
+    with ops.name_scope(name):
+      # The whole numbers j with lower_cutoff <= j < upper_cutoff.
+      interior = constant_op.constant(
+          np.arange(lower_cutoff_value, upper_cutoff_value), dtype=self.dtype)
+      return array_ops.concat(0, [
+          array_ops.reshape(below_value, [1]),
+          base_cdf_fn(interior),
+          array_ops.reshape(above_value, [1])])
+
+  def _cdf_table_lookup(self, table, y):
+    """Looks up the (log) cdf at `floor(y)` in a `_make_cdf_table` table."""
+    # Entry k of the table holds the cdf at lower_cutoff - 1 + k.  Points
+    # beyond the cutoffs, including +-inf, are clamped onto the first and last
+    # entries.  NaN would cast to an out of range index, so it is looked up at
+    # entry 0 and passed through.
+    is_nan = math_ops.is_nan(y)
+    index = math_ops.floor(y) - (self._lower_cutoff - 1.)
+    index = _select_scalar(is_nan, self._zero, index)
+    index = math_ops.maximum(index, 0.)
+    lower_cutoff_value, upper_cutoff_value = self._cdf_table_cutoffs
+    index = math_ops.minimum(
+        index, float(upper_cutoff_value - lower_cutoff_value + 1))
+    result = array_ops.gather(table, math_ops.cast(index, dtypes.int32))
+    return math_ops.select(is_nan, y, result)
+
   def _log_survival_function(self, y):
-    lower_cutoff = self._lower_cutoff
-    upper_cutoff = self._upper_cutoff
+    y = self._cast_if_integer(y)
 
     # Recall the promise:
     # survival_function(y) := P[Y > y]
@@ -355,26 +845,18 @@ class QuantizedDistribution(distribution.Distribution):
     j = math_ops.ceil(y)
 
     # P[X > j], used when lower_cutoff < X < upper_cutoff.
-    result_so_far = self.base_distribution.log_survival_function(j)
-
-    # Broadcast, because it's possible that this is a single distribution being
-    # evaluated on a number of samples, or something like that.
-    j += array_ops.zeros_like(result_so_far)
+    result_so_far, (below, above) = self._raw_log_survival_function(j)
 
     # Re-define values at the cutoffs.
-    if lower_cutoff is not None:
-      result_so_far = math_ops.select(j < lower_cutoff,
-                                      array_ops.zeros_like(result_so_far),
-                                      result_so_far)
-    if upper_cutoff is not None:
-      neg_inf = -np.inf * array_ops.ones_like(result_so_far)
-      result_so_far = math_ops.select(j >= upper_cutoff, neg_inf, result_so_far)
+    if below is not None:
+      result_so_far = _select_scalar(below, self._zero, result_so_far)
+    if above is not None:
+      result_so_far = _select_scalar(above, self._neg_inf, result_so_far)
 
     return result_so_far
 
   def _survival_function(self, y):
-    lower_cutoff = self._lower_cutoff
-    upper_cutoff = self._upper_cutoff
+    y = self._cast_if_integer(y)
 
     # Recall the promise:
     # survival_function(y) := P[Y > y]
@@ -387,28 +869,53 @@ class QuantizedDistribution(distribution.Distribution):
     j = math_ops.ceil(y)
 
     # P[X > j], used when lower_cutoff < X < upper_cutoff.
-    result_so_far = self.base_distribution.survival_function(j)
-
-    # Broadcast, because it's possible that this is a single distribution being
-    # evaluated on a number of samples, or something like that.
-    j += array_ops.zeros_like(result_so_far)
+    result_so_far, (below, above) = self._raw_survival_function(j)
 
     # Re-define values at the cutoffs.
-    if lower_cutoff is not None:
-      result_so_far = math_ops.select(j < lower_cutoff,
-                                      array_ops.ones_like(result_so_far),
-                                      result_so_far)
-    if upper_cutoff is not None:
-      result_so_far = math_ops.select(j >= upper_cutoff,
-                                      array_ops.zeros_like(result_so_far),
-                                      result_so_far)
+    if below is not None:
+      result_so_far = _select_scalar(below, self._one, result_so_far)
+    if above is not None:
+      result_so_far = _select_scalar(above, self._zero, result_so_far)
 
     return result_so_far
 
+  def _floor_checked_integer(self, y):
+    """Returns `floor(y)`, the point at which to evaluate `P[Y = y]`.
+
+    `Y` only has mass at whole numbers, so `floor(y)` serves as the
+    quantization point for both the cdf and survival function.  If
+    `validate_args`, `y` is asserted to be integer valued, and is returned
+    without the `floor`.
+
+    Args:
+      y:  `Tensor` at which to evaluate the pmf.
+
+    Returns:
+      `Tensor` with same shape and `dtype` as `y`.
+    """
+    y = self._check_integer(y)
+    if self.validate_args:
+      return y
+    return math_ops.floor(y)
+
+  def _cast_if_integer(self, y):
+    """Casts `y` to `dtype` if it has an integer `dtype`, e.g. samples."""
+    if y.dtype.is_integer:
+      return math_ops.cast(y, self.dtype)
+    return y
+
   def _check_integer(self, value):
+    if not self.validate_args:
+      # Nothing to check, so skip the name scope.  convert_to_tensor returns
+      # `value` itself if it is already a `Tensor`.
+      return self._cast_if_integer(ops.convert_to_tensor(value, name="value"))
     with ops.name_scope("check_integer", values=[value]):
       value = ops.convert_to_tensor(value, name="value")
-      if not self.validate_args:
+      if value.dtype.is_integer:
+        return self._cast_if_integer(value)
+      static_value = tensor_util.constant_value(value)
+      if static_value is not None and np.all(
+          static_value == np.floor(static_value)):
         return value
       dependencies = [distribution_util.assert_integer_form(
           value, message="value has non-integer components.")]
@@ -0,0 +1,185 @@
+# Copyright 2016 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""NumPy evaluation of the quantized Normal log pmf, outside of a graph.
+
+`log_prob_normal_quantized` agrees with `QuantizedDistribution(Normal).log_prob`
+and is meant for validating samples or `log_prob` on large NumPy arrays without
+building a graph.  If `numba` is installed, a pointwise loop is compiled and
+run in parallel.  Otherwise, if `scipy` is installed, the pmf is evaluated with
+vectorized NumPy and `scipy.special.log_ndtr`.  Neither is a dependency of
+TensorFlow; with neither, the pointwise loop runs as plain Python.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import math
+
+import numpy as np
+
+try:
+  # pylint: disable=g-import-not-at-top
+  import numba
+  HAS_NUMBA = True
+except ImportError:
+  HAS_NUMBA = False
+
+try:
+  # pylint: disable=g-import-not-at-top
+  from scipy import special
+  HAS_SCIPY = True
+except ImportError:
+  HAS_SCIPY = False
+
+__all__ = ["log_prob_normal_quantized"]
+
+# All of numba's fastmath flags except "nnan" and "ninf":  -inf is a legitimate
+# output (no mass), and must survive comparisons and arithmetic.
+_FASTMATH_FLAGS = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+if HAS_NUMBA:
+  _jit = numba.njit(fastmath=_FASTMATH_FLAGS, cache=True)
+  _jit_parallel = numba.njit(parallel=True, fastmath=_FASTMATH_FLAGS,
+                             cache=True)
+  _prange = numba.prange
+else:
+  _jit = lambda fn: fn
+  _jit_parallel = lambda fn: fn
+  _prange = range
+
+
+@_jit
+def _log_ndtr(z):
+  """Log of the standard Normal cdf, accurate in both tails."""
+  if z > 0.:
+    return math.log1p(-0.5 * math.erfc(z / math.sqrt(2.)))
+  if z > -20.:
+    return math.log(0.5 * math.erfc(-z / math.sqrt(2.)))
+  # Asymptotic series, since erfc underflows for large arguments.
+  z_sq_inv = 1. / (z * z)
+  series = 1. + z_sq_inv * (-1. + z_sq_inv * (3. + z_sq_inv * (
+      -15. + z_sq_inv * 105.)))
+  return (-0.5 * z * z - math.log(-z) - 0.5 * math.log(2. * math.pi) +
+          math.log(series))
+
+
+@_jit
+def _logsum_expbig_minus_expsmall(big, small):
+  """Stable evaluation of `Log[exp{big} - exp{small}]`, for `small <= big`."""
+  if big == -np.inf:
+    return -np.inf
+  d = small - big
+  if d > -math.log(2.):
+    return math.log(-math.expm1(d)) + big
+  return math.log1p(-math.exp(d)) + big
+
+
+@_jit_parallel
+def _log_prob_kernel(y, loc, scale, lower_cutoff, upper_cutoff, has_lower,
+                     has_upper, out):
+  for i in _prange(y.shape[0]):
+    j = np.floor(y[i])
+    z_y = (j - loc) / scale
+    z_y_minus_1 = (j - 1. - loc) / scale
+
+    # Cutoffs are rare relative to the interior, so these branches are cheap.
+    if (has_lower and j < lower_cutoff) or (has_upper and j > upper_cutoff):
+      out[i] = -np.inf
+    elif has_lower and j == lower_cutoff:
+      # P[X <= j]
+      out[i] = _log_ndtr(z_y)
+    elif has_upper and j == upper_cutoff:
+      # P[X > j - 1]
+      out[i] = _log_ndtr(-z_y_minus_1)
+    elif z_y > 0.:
+      # Right of the median the survival function is more accurate:
+      # Log[ sf(y - 1) - sf(y) ].
+      out[i] = _logsum_expbig_minus_expsmall(
+          _log_ndtr(-z_y_minus_1), _log_ndtr(-z_y))
+    else:
+      # Log[ cdf(y) - cdf(y - 1) ].
+      out[i] = _logsum_expbig_minus_expsmall(
+          _log_ndtr(z_y), _log_ndtr(z_y_minus_1))
+
+
+def _log_prob_vectorized(y, loc, scale, lower_cutoff, upper_cutoff):
+  """NumPy version of `_log_prob_kernel`, for use without `numba`."""
+  j = np.floor(y)
+  z_y = (j - loc) / scale
+  z_y_minus_1 = (j - 1. - loc) / scale
+
+  # Right of the median the survival function is more accurate, as in
+  # _log_prob_kernel.
+  use_sf = z_y > 0.
+  big = np.where(
+      use_sf, special.log_ndtr(-z_y_minus_1), special.log_ndtr(z_y))
+  small = np.where(
+      use_sf, special.log_ndtr(-z_y), special.log_ndtr(z_y_minus_1))
+  with np.errstate(divide="ignore", invalid="ignore"):
+    d = small - big
+    out = np.where(
+        d > -math.log(2.), np.log(-np.expm1(d)), np.log1p(-np.exp(d))) + big
+  out = np.where(big == -np.inf, -np.inf, out)
+
+  if lower_cutoff is not None:
+    out = np.where(j == lower_cutoff, special.log_ndtr(z_y), out)
+    out = np.where(j < lower_cutoff, -np.inf, out)
+  if upper_cutoff is not None:
+    out = np.where(j == upper_cutoff, special.log_ndtr(-z_y_minus_1), out)
+    out = np.where(j > upper_cutoff, -np.inf, out)
+  return out
+
+
+def log_prob_normal_quantized(y, loc, scale, lower_cutoff=None,
+                              upper_cutoff=None):
+  """Log pmf of a quantized Normal, evaluated with NumPy.
+
+  Equal to
+  `QuantizedDistribution(Normal, mu=loc, sigma=scale, lower_cutoff=...,
+  upper_cutoff=...).log_prob(y)`, without building or running a graph.
+
+  Args:
+    y:  Array-like of whole numbers.
+    loc:  Python `float`, mean of the base Normal.
+    scale:  Python `float`, standard deviation of the base Normal.  Must be
+      positive.
+    lower_cutoff:  Python `float` whole number, or `None`.
+    upper_cutoff:  Python `float` whole number, or `None`.
+
+  Returns:
+    `float64` `ndarray` with the shape of `y`.
+
+  Raises:
+    ValueError:  If `scale` is not positive, or the cutoffs are not ordered.
+  """
+  if not scale > 0.:
+    raise ValueError("scale must be positive, got %s" % scale)
+  if (lower_cutoff is not None and upper_cutoff is not None and
+      not lower_cutoff < upper_cutoff):
+    raise ValueError("lower_cutoff must be strictly less than upper_cutoff.")
+
+  y = np.asarray(y, dtype=np.float64)
+  if not HAS_NUMBA and HAS_SCIPY:
+    return _log_prob_vectorized(y, float(loc), float(scale), lower_cutoff,
+                                upper_cutoff)
+
+  out = np.empty(y.size, dtype=np.float64)
+  _log_prob_kernel(
+      y.ravel(), float(loc), float(scale),
+      np.nan if lower_cutoff is None else float(lower_cutoff),
+      np.nan if upper_cutoff is None else float(upper_cutoff),
+      lower_cutoff is not None, upper_cutoff is not None, out)
+  return out.reshape(y.shape)